@@ -1,3 +1,4 @@
+import os
 import sqlite3
 from pathlib import Path
 from typing import Optional, Any
@@ -7,6 +8,17 @@ import polars as pl
 BASE_SQL_DIR = Path.cwd() / "sql_scripts"
 raw_db = 'raw_occupation.db'
 curated_db = 'curated_occupation.db'
+
+# Root directory for per-region / per-release shards:
+#   shards/<region>/<release>/{raw,curated}_occupation.db
+SHARD_ROOT = Path.cwd() / "shards"
+
+# Setting TULSA_REGION and TULSA_RELEASE points every pipeline script at that
+# shard instead of the single default warehouse. SQL scripts are taken from
+# sql_scripts/<region>/<release>/ when that directory exists. Setting only one
+# of the two is an error, so a shard run never rebuilds the default warehouse.
+shard_region = os.environ.get("TULSA_REGION")
+shard_release = os.environ.get("TULSA_RELEASE")
 # -----------------------------
 # File & SQL Script Utilities
 # -----------------------------
@@ -35,6 +47,71 @@ def read_sql_script(filename: str) -> Optional[str]:
         return None
 
 
+# -----------------------------
+# Shard Utilities
+# -----------------------------
+def shard_db_path(db_name: str, region: str, release: str) -> Path:
+    """
+    Builds the path of a database file belonging to a single region/release shard.
+
+    Parameters
+    ----------
+    db_name : str
+        Base database file name (e.g., 'curated_occupation.db').
+    region : str
+        Region the shard holds data for (e.g., 'tulsa').
+    release : str
+        O*NET release the shard was built from (e.g., '29.0').
+
+    Returns
+    -------
+    Path
+        Path of the form ``shards/<region>/<release>/<db_name>``.
+    """
+
+    return SHARD_ROOT / region / release / db_name
+
+
+def list_shards(db_name: str = curated_db) -> list[tuple[str, str, Path]]:
+    """
+    Lists every region/release shard that has the given database file built.
+
+    Parameters
+    ----------
+    db_name : str, default curated_db
+        Database file name to look for inside each shard directory.
+
+    Returns
+    -------
+    list[tuple[str, str, Path]]
+        Sorted ``(region, release, db_path)`` tuples; empty if no shards exist.
+    """
+
+    return [
+        (db_path.parent.parent.name, db_path.parent.name, db_path)
+        for db_path in sorted(SHARD_ROOT.glob(f"*/*/{db_name}"))
+    ]
+
+
+if bool(shard_region) != bool(shard_release):
+    raise ValueError(
+        "TULSA_REGION and TULSA_RELEASE must be set together "
+        f"(got TULSA_REGION={shard_region!r}, TULSA_RELEASE={shard_release!r})"
+    )
+
+if shard_region and shard_release:
+    raw_db = str(shard_db_path(raw_db, shard_region, shard_release))
+    curated_db = str(shard_db_path(curated_db, shard_region, shard_release))
+    shard_sql_dir = BASE_SQL_DIR / shard_region / shard_release
+    if shard_sql_dir.is_dir():
+        BASE_SQL_DIR = shard_sql_dir
+    else:
+        print(
+            f"Warning: {shard_sql_dir} not found; shard {shard_region}/{shard_release} "
+            f"falls back to the shared SQL scripts in {BASE_SQL_DIR}"
+        )
+
+
 # -----------------------------
 # DataFrame Cleaning Utilities
 # -----------------------------
@@ -259,22 +336,31 @@ def read_data_from_sql(conn: sqlite3.Connection, table_name: str) -> pl.DataFram
     return pl.DataFrame(rows, schema=col_names, orient="row")
 
 
-def write_data_to_sql(engine: Any, df: pl.DataFrame, table_name: str) -> Optional[str]:
+def write_data_to_sql(
+    engine: Any,
+    df: pl.DataFrame,
+    table_name: str,
+    raise_on_error: bool = False
+) -> Optional[str]:
     """
     Writes a Polars DataFrame to a specified SQL table.
 
     Parameters
     ----------
+    engine : sqlalchemy.Engine or compatible connection
+        Connection target passed to `pl.DataFrame.write_database`.
     df : pl.DataFrame
         The Polars DataFrame to write to the SQL table.
-    conn : sqlite3.Connection or compatible DB-API connection
-        An active database connection object.
     table_name : str
         The name of the SQL table to write data to.
+    raise_on_error : bool, default False
+        If True, re-raise the write error after printing it instead of
+        returning None.
 
     Returns
     -------
-    None
+    str or None
+        A success message, or None if the write failed and `raise_on_error` is False.
     """
 
     try:
@@ -286,4 +372,6 @@ def write_data_to_sql(engine: Any, df: pl.DataFrame, table_name: str) -> Optiona
         return f"Write successful for table: {table_name}"
     except Exception as e:
         print(f"Error writing DataFrame to SQL table '{table_name}': {e}")
-        return None
\ No newline at end of file
+        if raise_on_error:
+            raise
+        return None
\ No newline at end of file
@@ -1,3 +1,5 @@
+from pathlib import Path
+
 from generic_functions_01 import (
     commit_transaction,
     db_connection,
@@ -6,12 +8,16 @@ from generic_functions_01 import (
     close_connection,
     raw_db
 )
+from raw_snapshot_07 import load_snapshot
 
 
 def execute_sql_scripts(db_name: str, sql_files: list[str]) -> None:
     """
     Executes a list of SQL script files against a SQLite database.
 
+    Tables with an up-to-date binary snapshot (see `raw_snapshot_07.py`) are
+    loaded from the snapshot instead; the SQL file is used otherwise.
+
     Parameters
     ----------
     db_name : str
@@ -19,10 +25,18 @@ def execute_sql_scripts(db_name: str, sql_files: list[str]) -> None:
     sql_files : list[str]
         List of SQL filenames to execute.
     """
+    Path(db_name).parent.mkdir(parents=True, exist_ok=True)
     conn = db_connection(db_name)
     cursor = create_cursor(conn)
 
     for file_name in sql_files:
+        try:
+            if load_snapshot(conn, file_name):
+                print(f"Loaded snapshot for file: {file_name}")
+                continue
+        except Exception as e:
+            print(f"Error loading snapshot for file: {file_name}, Error: {e}")
+
         sql_script = read_sql_script(file_name)
 
         if not sql_script:
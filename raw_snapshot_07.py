@@ -0,0 +1,245 @@
+import hashlib
+import os
+import re
+import sqlite3
+from pathlib import Path
+from typing import Optional
+
+import pyarrow as pa
+from generic_functions_01 import (
+    BASE_SQL_DIR,
+    db_connection,
+    create_cursor,
+    close_connection,
+    read_sql_script
+)
+
+# Snapshots live next to the SQL scripts they were built from, so each
+# region/release shard keeps its own set.
+SNAPSHOT_DIR = BASE_SQL_DIR / ".snapshots"
+
+# Rows per record batch; loads convert one batch at a time to Python objects.
+SNAPSHOT_BATCH_ROWS = 10_000
+
+CREATE_TABLE_PATTERN = re.compile(r"CREATE TABLE (\w+) \((.*?)\);", re.DOTALL)
+COLUMN_PATTERN = re.compile(r"^\s*(\w+) ([A-Z]+(?: VARYING)?(?:\(\d+(?:,\s*\d+)?\))?)(.*?),?\s*$")
+
+
+# -----------------------------
+# Schema Utilities
+# -----------------------------
+def sql_type_to_arrow(sql_type: str) -> pa.DataType:
+    """
+    Maps a column type from the O*NET `CREATE TABLE` statements to an Arrow type.
+
+    DATE columns are kept as ISO strings because that is how the raw SQLite
+    layer stores them.
+
+    Parameters
+    ----------
+    sql_type : str
+        Column type as written in the DDL (e.g., 'DECIMAL(5,2)').
+
+    Returns
+    -------
+    pa.DataType
+        Matching Arrow type.
+    """
+    decimal = re.match(r"DECIMAL\((\d+),\s*(\d+)\)", sql_type)
+    if decimal:
+        return pa.int64() if int(decimal.group(2)) == 0 else pa.float64()
+    if sql_type.startswith(("CHARACTER", "DATE")):
+        return pa.string()
+    raise ValueError(f"Unsupported column type in CREATE TABLE: {sql_type}")
+
+
+def parse_create_table(sql_script: str) -> tuple[str, str, pa.Schema]:
+    """
+    Extracts the table name, DDL, and Arrow schema from a SQL dump script.
+
+    Parameters
+    ----------
+    sql_script : str
+        Full contents of a file from `sql_scripts/`.
+
+    Returns
+    -------
+    tuple[str, str, pa.Schema]
+        Table name, the `CREATE TABLE` statement, and the column schema.
+    """
+    match = CREATE_TABLE_PATTERN.search(sql_script)
+    if not match:
+        raise ValueError("No CREATE TABLE statement found in SQL script")
+
+    fields = []
+    for line in match.group(2).splitlines():
+        column = COLUMN_PATTERN.match(line)
+        if not column or column.group(1) in ("PRIMARY", "FOREIGN"):
+            continue
+        name, sql_type, constraints = column.groups()
+        fields.append(pa.field(
+            name, sql_type_to_arrow(sql_type.strip()), nullable="NOT NULL" not in constraints
+        ))
+
+    return match.group(1), match.group(0), pa.schema(fields)
+
+
+# -----------------------------
+# Snapshot Build & Load
+# -----------------------------
+def snapshot_path(filename: str) -> Path:
+    """
+    Returns where the snapshot for a SQL script is stored.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the SQL file (e.g., '16_skills.sql').
+
+    Returns
+    -------
+    Path
+        Path of the `.arrow` snapshot file.
+    """
+    return SNAPSHOT_DIR / f"{Path(filename).stem}.arrow"
+
+
+def source_checksum(filename: str) -> Optional[str]:
+    """
+    Hashes a SQL script so snapshots can be checked against their source.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the SQL file.
+
+    Returns
+    -------
+    str or None
+        SHA-256 hex digest, or None if the SQL file does not exist.
+    """
+    sql_path = BASE_SQL_DIR / filename
+    if not sql_path.exists():
+        return None
+    return hashlib.sha256(sql_path.read_bytes()).hexdigest()
+
+
+def build_snapshot(filename: str) -> Optional[Path]:
+    """
+    Converts a SQL dump script into a zstd-compressed Arrow IPC snapshot.
+
+    The script is executed once into an in-memory SQLite database and the
+    resulting table is written column by column. The DDL and a checksum of
+    the SQL file are stored in the snapshot metadata.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the SQL file to convert.
+
+    Returns
+    -------
+    Path or None
+        Path of the written snapshot; None if the SQL file could not be read.
+    """
+    sql_script = read_sql_script(filename)
+    if not sql_script:
+        return None
+
+    table_name, ddl, schema = parse_create_table(sql_script)
+
+    conn = db_connection(":memory:")
+    try:
+        cursor = create_cursor(conn)
+        cursor.executescript(sql_script)
+        cursor.execute(f"SELECT {', '.join(schema.names)} FROM {table_name}")
+        rows = cursor.fetchall()
+    finally:
+        close_connection(conn)
+
+    columns = list(zip(*rows)) if rows else [[] for _ in schema]
+    table = pa.Table.from_arrays(
+        [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+        schema=schema.with_metadata({
+            "table_name": table_name,
+            "ddl": ddl,
+            "source_sha256": source_checksum(filename)
+        })
+    )
+
+    path = snapshot_path(filename)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".arrow.tmp")
+    options = pa.ipc.IpcWriteOptions(compression="zstd")
+    with pa.OSFile(str(tmp_path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+            writer.write_table(table, max_chunksize=SNAPSHOT_BATCH_ROWS)
+    os.replace(tmp_path, path)
+
+    print(f"Built snapshot for {filename}: {path} ({table.num_rows} rows)")
+    return path
+
+
+def load_snapshot(conn: sqlite3.Connection, filename: str) -> bool:
+    """
+    Loads a raw table from its snapshot instead of executing the SQL script.
+
+    The snapshot is memory-mapped and its checksum is read from the schema
+    metadata before any data is decoded. If it does not match the current SQL
+    file, the SQL file remains the source of truth and nothing is written.
+    Rows are decompressed and converted to Python objects one record batch at
+    a time for `executemany`, so only the file read is zero-copy.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        Connection to the raw database being bootstrapped.
+    filename : str
+        Name of the SQL file the snapshot was built from.
+
+    Returns
+    -------
+    bool
+        True if the table was loaded from the snapshot, False if the caller
+        should fall back to the SQL script.
+    """
+    path = snapshot_path(filename)
+    if not path.exists():
+        return False
+
+    with pa.memory_map(str(path), "r") as source:
+        reader = pa.ipc.open_file(source)
+        metadata = {k.decode(): v.decode() for k, v in reader.schema.metadata.items()}
+        checksum = source_checksum(filename)
+        if checksum is not None and checksum != metadata["source_sha256"]:
+            print(f"Snapshot is stale for file: {filename}")
+            return False
+
+        column_names = reader.schema.names
+        placeholders = ", ".join("?" for _ in column_names)
+        insert_sql = (
+            f"INSERT INTO {metadata['table_name']} ({', '.join(column_names)}) "
+            f"VALUES ({placeholders})"
+        )
+
+        cursor = create_cursor(conn)
+        cursor.execute("SAVEPOINT load_snapshot")
+        try:
+            cursor.execute(metadata["ddl"])
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                cursor.executemany(insert_sql, zip(*(col.to_pylist() for col in batch.columns)))
+        except Exception:
+            cursor.execute("ROLLBACK TO load_snapshot")
+            cursor.execute("RELEASE load_snapshot")
+            raise
+        cursor.execute("RELEASE load_snapshot")
+    return True
+
+
+if __name__ == "__main__":
+    for sql_path in sorted(BASE_SQL_DIR.glob("*.sql")):
+        try:
+            build_snapshot(sql_path.name)
+        except Exception as e:
+            print(f"Error building snapshot for file: {sql_path.name}, Error: {e}")
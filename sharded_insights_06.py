@@ -0,0 +1,259 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import polars as pl
+from generic_functions_01 import (
+    db_connection,
+    close_connection,
+    list_shards,
+    curated_db
+)
+
+# SQLite refuses to ATTACH more than 10 databases per connection by default.
+MAX_ATTACHED_SHARDS = 10
+
+# Each insight is split into a partial query that every shard can answer on its
+# own and a merge spec that combines the partial results into the final report.
+# AVG is shipped as SUM/COUNT and COUNT(DISTINCT ...) as the distinct values,
+# so merging across shards gives the same answer as one combined database.
+# `{db}` is the schema the shard's tables live in ('main' or an attached alias).
+SHARDED_INSIGHTS = [
+    {
+        "title": "Top 10 Skills for High-Preparation Jobs",
+        "sql": """
+        SELECT
+            dlsa.anchor_description AS skill_name,
+            SUM(fs.data_value) AS skill_score_sum,
+            COUNT(fs.data_value) AS skill_score_count
+        FROM {db}.fact_skills fs
+        JOIN {db}.fact_job_zones fjz
+            ON fs.onetsoc_code = fjz.onetsoc_code
+        JOIN {db}.dim_job_zone_reference djzr
+            ON fjz.job_zone = djzr.job_zone
+        JOIN {db}.dim_level_scale_anchors dlsa
+            ON fs.element_id = dlsa.element_id
+           AND fs.scale_id = dlsa.scale_id
+        WHERE djzr.job_zone >= 4
+        GROUP BY dlsa.anchor_description
+        """,
+        "keys": ["skill_name"],
+        "avg": {"avg_skill_score": ("skill_score_sum", "skill_score_count")},
+        "sort": ["avg_skill_score"],
+        "descending": True,
+        "limit": 10
+    },
+    {
+        "title": "Average Knowledge Score by Job Zone",
+        "sql": """
+        SELECT
+            djzr.job_zone,
+            djzr.name AS job_zone_name,
+            SUM(fk.data_value) AS knowledge_score_sum,
+            COUNT(fk.data_value) AS knowledge_score_count
+        FROM {db}.fact_knowledge fk
+        JOIN {db}.fact_job_zones fjz
+            ON fk.onetsoc_code = fjz.onetsoc_code
+        JOIN {db}.dim_job_zone_reference djzr
+            ON fjz.job_zone = djzr.job_zone
+        GROUP BY djzr.job_zone, djzr.name
+        """,
+        "keys": ["job_zone", "job_zone_name"],
+        "avg": {"avg_knowledge_score": ("knowledge_score_sum", "knowledge_score_count")},
+        "sort": ["job_zone"],
+        "descending": False,
+        "limit": None
+    },
+    {
+        "title": "Occupations with Highest Ability Requirements",
+        "sql": """
+        SELECT
+            dod.title AS occupation_title,
+            dlsa.anchor_description AS ability_name,
+            SUM(fa.data_value) AS ability_score_sum,
+            COUNT(fa.data_value) AS ability_score_count
+        FROM {db}.fact_abilities fa
+        JOIN {db}.dim_occupation_data dod
+            ON fa.onetsoc_code = dod.onetsoc_code
+        JOIN {db}.dim_level_scale_anchors dlsa
+            ON fa.element_id = dlsa.element_id
+           AND fa.scale_id = dlsa.scale_id
+        GROUP BY dod.title, dlsa.anchor_description
+        """,
+        "keys": ["occupation_title", "ability_name"],
+        "avg": {"avg_ability_score": ("ability_score_sum", "ability_score_count")},
+        "sort": ["avg_ability_score"],
+        "descending": True,
+        "limit": 10
+    },
+    {
+        "title": "Occupations with Broadest Ability Requirements",
+        "sql": """
+        SELECT DISTINCT
+            dod.title AS occupation_title,
+            fa.element_id
+        FROM {db}.fact_abilities fa
+        JOIN {db}.dim_occupation_data dod
+            ON fa.onetsoc_code = dod.onetsoc_code
+        """,
+        "keys": ["occupation_title"],
+        "distinct": {"distinct_abilities_count": "element_id"},
+        "sort": ["distinct_abilities_count"],
+        "descending": True,
+        "limit": 10
+    }
+]
+
+
+def query_shard(db_path: str, sql: str) -> pl.DataFrame:
+    """
+    Runs a partial insight query against a single shard database.
+
+    Intended to be executed inside a worker process, so it opens and closes
+    its own connection.
+
+    Parameters
+    ----------
+    db_path : str
+        Path to the shard's curated SQLite database.
+    sql : str
+        Partial query with its `{db}` placeholder still unformatted.
+
+    Returns
+    -------
+    pl.DataFrame
+        The shard's partial aggregates.
+    """
+    conn = db_connection(db_path)
+    try:
+        return pl.read_database(sql.format(db="main"), conn)
+    finally:
+        close_connection(conn)
+
+
+def query_attached(db_paths: list[str], sql: str) -> pl.DataFrame:
+    """
+    Attaches all shards to one connection and runs the partial query against
+    each of them as a single UNION ALL statement.
+
+    Parameters
+    ----------
+    db_paths : list[str]
+        Paths to the shards' curated SQLite databases.
+    sql : str
+        Partial query with its `{db}` placeholder still unformatted.
+
+    Returns
+    -------
+    pl.DataFrame
+        The partial aggregates of every shard, stacked.
+    """
+    if len(db_paths) > MAX_ATTACHED_SHARDS:
+        raise ValueError(
+            f"Cannot attach {len(db_paths)} shards; SQLite allows at most "
+            f"{MAX_ATTACHED_SHARDS}. Use parallel mode instead."
+        )
+
+    conn = db_connection(":memory:")
+    try:
+        aliases = []
+        for i, db_path in enumerate(db_paths):
+            alias = f"shard_{i}"
+            conn.execute(f"ATTACH DATABASE ? AS {alias}", (db_path,))
+            aliases.append(alias)
+
+        union_sql = "\nUNION ALL\n".join(sql.format(db=alias) for alias in aliases)
+        return pl.read_database(union_sql, conn)
+    finally:
+        close_connection(conn)
+
+
+def merge_partials(partials: list[pl.DataFrame], spec: dict) -> pl.DataFrame:
+    """
+    Combines per-shard partial aggregates into the final insight result.
+
+    Parameters
+    ----------
+    partials : list[pl.DataFrame]
+        Partial results returned by each shard (or by the attached query).
+    spec : dict
+        Insight definition from `SHARDED_INSIGHTS`.
+
+    Returns
+    -------
+    pl.DataFrame
+        Merged, sorted, and limited result matching the single-database query.
+    """
+    df = pl.concat(partials, how="vertical_relaxed")
+
+    aggs = [
+        (pl.col(sum_col).sum() / pl.col(count_col).sum()).round(2).alias(name)
+        for name, (sum_col, count_col) in spec.get("avg", {}).items()
+    ]
+    aggs += [
+        pl.col(col).n_unique().alias(name)
+        for name, col in spec.get("distinct", {}).items()
+    ]
+
+    # Group keys break ties so parallel and attached runs print the same rows.
+    df = df.group_by(spec["keys"]).agg(aggs).sort(
+        spec["sort"] + spec["keys"],
+        descending=[spec["descending"]] * len(spec["sort"]) + [False] * len(spec["keys"])
+    )
+    if spec["limit"]:
+        df = df.head(spec["limit"])
+    return df
+
+
+def run_sharded_insights(db_paths: list[str], attach: bool = False) -> None:
+    """
+    Runs every insight across all shards and prints the merged results.
+
+    Parameters
+    ----------
+    db_paths : list[str]
+        Paths to the shards' curated SQLite databases.
+    attach : bool, default False
+        If True, answer each insight with ATTACH DATABASE queries over groups
+        of at most `MAX_ATTACHED_SHARDS` shards; otherwise fan the partial
+        queries out to one worker process per core.
+    """
+    pool = None if attach else ProcessPoolExecutor(
+        max_workers=min(len(db_paths), os.cpu_count() or 1)
+    )
+    try:
+        for spec in SHARDED_INSIGHTS:
+            if pool is None:
+                partials = [
+                    query_attached(db_paths[i:i + MAX_ATTACHED_SHARDS], spec["sql"])
+                    for i in range(0, len(db_paths), MAX_ATTACHED_SHARDS)
+                ]
+            else:
+                partials = list(pool.map(query_shard, db_paths, [spec["sql"]] * len(db_paths)))
+
+            print(f"\n{'=' * 80}")
+            print(f"{spec['title']} ({len(db_paths)} shards)")
+            print(f"{'=' * 80}")
+            print(merge_partials(partials, spec))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cross-region / cross-release insights.")
+    parser.add_argument("--region", action="append", help="Limit to these regions.")
+    parser.add_argument("--release", action="append", help="Limit to these releases.")
+    parser.add_argument("--attach", action="store_true", help="Use ATTACH DATABASE instead of worker processes.")
+    args = parser.parse_args()
+
+    shards = [
+        str(db_path) for region, release, db_path in list_shards(Path(curated_db).name)
+        if (not args.region or region in args.region)
+        and (not args.release or release in args.release)
+    ]
+    if not shards:
+        print("No curated shards found under shards/<region>/<release>/")
+    else:
+        run_sharded_insights(shards, attach=args.attach)
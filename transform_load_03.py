@@ -1,3 +1,9 @@
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+import polars as pl
 from generic_functions_01 import (
     db_connection,
     read_data_from_sql,
@@ -10,154 +16,434 @@ from generic_functions_01 import (
 )
 from sqlalchemy import create_engine
 
-# Read data from SQLite database
-read_conn = db_connection(raw_db)
-engine = create_engine(f"sqlite:///{curated_db}")
 
-# Abilities
-abilities_df = read_data_from_sql(read_conn, "abilities")
-abilities_df = clean_func(
-    abilities_df,
-    null_check_cols=["standard_error", "lower_ci_bound"],
-    replace_null_value=0
-)
-abilities_df = clean_func(
-    abilities_df,
-    null_check_cols=["upper_ci_bound"],
-    replace_null_value=100
-)
-abilities_df = clean_func(
-    abilities_df,
-    null_check_cols=["not_relevant"],
-    replace_null_value="Undefined"
-)
-write_data_to_sql(engine, abilities_df, "fact_abilities")
+# -----------------------------
+# Table Transforms
+# -----------------------------
+def transform_abilities(read_conn: sqlite3.Connection) -> pl.DataFrame:
+    """
+    Reads the raw `abilities` table for `fact_abilities`.
 
-# Education_Training_Experience
-education_training_experience_df = read_data_from_sql(
-    read_conn, "education_training_experience"
-)
-education_training_experience_df = rename_column(
-    education_training_experience_df, "n", "sample_size"
-)
-education_training_experience_df = clean_func(
-    education_training_experience_df,
-    null_check_cols=[
-        "category", "data_value", "sample_size", "standard_error",
-        "lower_ci_bound"
-    ],
-    replace_null_value=0
-)
+    Fills nulls in `standard_error` and `lower_ci_bound` with 0,
+    `upper_ci_bound` with 100, and `not_relevant` with "Undefined".
 
-education_training_experience_df = clean_func(
-    education_training_experience_df,
-    null_check_cols=[
-         "upper_ci_bound"
-    ],
-    replace_null_value=100
-)
-education_training_experience_df = clean_func(
-    education_training_experience_df,
-    null_check_cols=["recommend_suppress"],
-    replace_null_value="Undefined"
-)
-write_data_to_sql(
-    engine, education_training_experience_df, "fact_education_training_experience"
-)
+    Parameters
+    ----------
+    read_conn : sqlite3.Connection
+        Connection to the raw database.
 
-# Job_zone_reference
-job_zone_reference_df = read_data_from_sql(read_conn, "job_zone_reference")
-job_zone_reference_df = clean_func(
-    job_zone_reference_df,
-    null_check_cols=["name"],
-    replace_null_value="Undefined"
-)
-write_data_to_sql(engine, job_zone_reference_df, "dim_job_zone_reference")
+    Returns
+    -------
+    pl.DataFrame
+        The cleaned table, ready to be written to the curated database.
+    """
+    abilities_df = read_data_from_sql(read_conn, "abilities")
+    abilities_df = clean_func(
+        abilities_df,
+        null_check_cols=["standard_error", "lower_ci_bound"],
+        replace_null_value=0
+    )
+    abilities_df = clean_func(
+        abilities_df,
+        null_check_cols=["upper_ci_bound"],
+        replace_null_value=100
+    )
+    abilities_df = clean_func(
+        abilities_df,
+        null_check_cols=["not_relevant"],
+        replace_null_value="Undefined"
+    )
+    return abilities_df
 
-# Occupation Data
-occupation_data_df = read_data_from_sql(read_conn, "occupation_data")
-write_data_to_sql(engine, occupation_data_df, "dim_occupation_data")
 
-# Occupation Level Metadata
-occupation_level_metadata_df = read_data_from_sql(
-    read_conn, "occupation_level_metadata"
-)
-occupation_level_metadata_df = rename_column(
-    occupation_level_metadata_df, "n", "sample_size"
-)
-occupation_level_metadata_df = clean_func(
-    occupation_level_metadata_df,
-    null_check_cols=["response"],
-    replace_null_value="No response"
-)
-occupation_level_metadata_df = clean_func(
-    occupation_level_metadata_df,
-    null_check_cols=["sample_size", "percent"],
-    replace_null_value=0
-)
-write_data_to_sql(
-    engine, occupation_level_metadata_df, "dim_occupation_level_metadata"
-)
+def transform_education_training_experience(read_conn: sqlite3.Connection) -> pl.DataFrame:
+    """
+    Reads the raw `education_training_experience` table for
+    `fact_education_training_experience`.
 
-# Job zones
-job_zones_df = read_data_from_sql(read_conn, "job_zones")
-write_data_to_sql(engine, job_zones_df, "fact_job_zones")
-
-# Knowledge
-knowledge_df = read_data_from_sql(read_conn, "knowledge")
-knowledge_df = rename_column(knowledge_df, "n", "sample_size")
-knowledge_df = clean_func(
-    knowledge_df,
-    null_check_cols=[
-        "data_value", "sample_size", "standard_error",
-        "lower_ci_bound"
-    ],
-    replace_null_value=0
-)
-knowledge_df = clean_func(
-    knowledge_df,
-    null_check_cols=[
-        "upper_ci_bound"
-    ],
-    replace_null_value=100
-)
+    Renames `n` to `sample_size`; fills nulls in `category`, `data_value`,
+    `sample_size`, `standard_error` and `lower_ci_bound` with 0,
+    `upper_ci_bound` with 100, and `recommend_suppress` with "Undefined".
 
-knowledge_df = clean_func(
-    knowledge_df,
-    null_check_cols=["recommend_suppress", "not_relevant"],
-    replace_null_value="Undefined"
-)
-write_data_to_sql(engine, knowledge_df, "fact_knowledge")
-
-# Skills
-skills_df = read_data_from_sql(read_conn, "skills")
-skills_df = rename_column(skills_df, "n", "sample_size")
-skills_df = clean_func(
-    skills_df,
-    null_check_cols=[
-        "data_value", "sample_size", "standard_error",
-        "lower_ci_bound"
-    ],
-    replace_null_value=0
-)
-skills_df = clean_func(
-    skills_df,
-    null_check_cols=[
-        "upper_ci_bound"
-    ],
-    replace_null_value=100
-)
-skills_df = clean_func(
-    skills_df,
-    null_check_cols=["recommend_suppress", "not_relevant"],
-    replace_null_value="Undefined"
-)
-write_data_to_sql(engine, skills_df, "fact_skills")
+    Parameters
+    ----------
+    read_conn : sqlite3.Connection
+        Connection to the raw database.
+
+    Returns
+    -------
+    pl.DataFrame
+        The cleaned table, ready to be written to the curated database.
+    """
+    education_training_experience_df = read_data_from_sql(
+        read_conn, "education_training_experience"
+    )
+    education_training_experience_df = rename_column(
+        education_training_experience_df, "n", "sample_size"
+    )
+    education_training_experience_df = clean_func(
+        education_training_experience_df,
+        null_check_cols=[
+            "category", "data_value", "sample_size", "standard_error",
+            "lower_ci_bound"
+        ],
+        replace_null_value=0
+    )
+
+    education_training_experience_df = clean_func(
+        education_training_experience_df,
+        null_check_cols=[
+             "upper_ci_bound"
+        ],
+        replace_null_value=100
+    )
+    education_training_experience_df = clean_func(
+        education_training_experience_df,
+        null_check_cols=["recommend_suppress"],
+        replace_null_value="Undefined"
+    )
+    return education_training_experience_df
+
+
+def transform_job_zone_reference(read_conn: sqlite3.Connection) -> pl.DataFrame:
+    """
+    Reads the raw `job_zone_reference` table for `dim_job_zone_reference`.
+
+    Fills nulls in `name` with "Undefined".
+
+    Parameters
+    ----------
+    read_conn : sqlite3.Connection
+        Connection to the raw database.
+
+    Returns
+    -------
+    pl.DataFrame
+        The cleaned table, ready to be written to the curated database.
+    """
+    job_zone_reference_df = read_data_from_sql(read_conn, "job_zone_reference")
+    job_zone_reference_df = clean_func(
+        job_zone_reference_df,
+        null_check_cols=["name"],
+        replace_null_value="Undefined"
+    )
+    return job_zone_reference_df
+
+
+def transform_occupation_data(read_conn: sqlite3.Connection) -> pl.DataFrame:
+    """
+    Reads the raw `occupation_data` table for `dim_occupation_data`.
+
+    No cleaning is applied.
+
+    Parameters
+    ----------
+    read_conn : sqlite3.Connection
+        Connection to the raw database.
+
+    Returns
+    -------
+    pl.DataFrame
+        The cleaned table, ready to be written to the curated database.
+    """
+    return read_data_from_sql(read_conn, "occupation_data")
+
+
+def transform_occupation_level_metadata(read_conn: sqlite3.Connection) -> pl.DataFrame:
+    """
+    Reads the raw `occupation_level_metadata` table for
+    `dim_occupation_level_metadata`.
+
+    Renames `n` to `sample_size`; fills nulls in `response` with
+    "No response", and `sample_size` and `percent` with 0.
+
+    Parameters
+    ----------
+    read_conn : sqlite3.Connection
+        Connection to the raw database.
+
+    Returns
+    -------
+    pl.DataFrame
+        The cleaned table, ready to be written to the curated database.
+    """
+    occupation_level_metadata_df = read_data_from_sql(
+        read_conn, "occupation_level_metadata"
+    )
+    occupation_level_metadata_df = rename_column(
+        occupation_level_metadata_df, "n", "sample_size"
+    )
+    occupation_level_metadata_df = clean_func(
+        occupation_level_metadata_df,
+        null_check_cols=["response"],
+        replace_null_value="No response"
+    )
+    occupation_level_metadata_df = clean_func(
+        occupation_level_metadata_df,
+        null_check_cols=["sample_size", "percent"],
+        replace_null_value=0
+    )
+    return occupation_level_metadata_df
+
+
+def transform_job_zones(read_conn: sqlite3.Connection) -> pl.DataFrame:
+    """
+    Reads the raw `job_zones` table for `fact_job_zones`.
+
+    No cleaning is applied.
+
+    Parameters
+    ----------
+    read_conn : sqlite3.Connection
+        Connection to the raw database.
+
+    Returns
+    -------
+    pl.DataFrame
+        The cleaned table, ready to be written to the curated database.
+    """
+    return read_data_from_sql(read_conn, "job_zones")
+
+
+def transform_knowledge(read_conn: sqlite3.Connection) -> pl.DataFrame:
+    """
+    Reads the raw `knowledge` table for `fact_knowledge`.
+
+    Renames `n` to `sample_size`; fills nulls in `data_value`, `sample_size`,
+    `standard_error` and `lower_ci_bound` with 0, `upper_ci_bound` with 100,
+    and `recommend_suppress` and `not_relevant` with "Undefined".
+
+    Parameters
+    ----------
+    read_conn : sqlite3.Connection
+        Connection to the raw database.
+
+    Returns
+    -------
+    pl.DataFrame
+        The cleaned table, ready to be written to the curated database.
+    """
+    knowledge_df = read_data_from_sql(read_conn, "knowledge")
+    knowledge_df = rename_column(knowledge_df, "n", "sample_size")
+    knowledge_df = clean_func(
+        knowledge_df,
+        null_check_cols=[
+            "data_value", "sample_size", "standard_error",
+            "lower_ci_bound"
+        ],
+        replace_null_value=0
+    )
+    knowledge_df = clean_func(
+        knowledge_df,
+        null_check_cols=[
+            "upper_ci_bound"
+        ],
+        replace_null_value=100
+    )
+
+    knowledge_df = clean_func(
+        knowledge_df,
+        null_check_cols=["recommend_suppress", "not_relevant"],
+        replace_null_value="Undefined"
+    )
+    return knowledge_df
+
+
+def transform_skills(read_conn: sqlite3.Connection) -> pl.DataFrame:
+    """
+    Reads the raw `skills` table for `fact_skills`.
+
+    Renames `n` to `sample_size`; fills nulls in `data_value`, `sample_size`,
+    `standard_error` and `lower_ci_bound` with 0, `upper_ci_bound` with 100,
+    and `recommend_suppress` and `not_relevant` with "Undefined".
+
+    Parameters
+    ----------
+    read_conn : sqlite3.Connection
+        Connection to the raw database.
+
+    Returns
+    -------
+    pl.DataFrame
+        The cleaned table, ready to be written to the curated database.
+    """
+    skills_df = read_data_from_sql(read_conn, "skills")
+    skills_df = rename_column(skills_df, "n", "sample_size")
+    skills_df = clean_func(
+        skills_df,
+        null_check_cols=[
+            "data_value", "sample_size", "standard_error",
+            "lower_ci_bound"
+        ],
+        replace_null_value=0
+    )
+    skills_df = clean_func(
+        skills_df,
+        null_check_cols=[
+            "upper_ci_bound"
+        ],
+        replace_null_value=100
+    )
+    skills_df = clean_func(
+        skills_df,
+        null_check_cols=["recommend_suppress", "not_relevant"],
+        replace_null_value="Undefined"
+    )
+    return skills_df
+
+
+def transform_level_scale_anchors(read_conn: sqlite3.Connection) -> pl.DataFrame:
+    """
+    Reads the raw `level_scale_anchors` table for `dim_level_scale_anchors`.
+
+    Applies the standard column-name and whitespace cleaning only.
+
+    Parameters
+    ----------
+    read_conn : sqlite3.Connection
+        Connection to the raw database.
+
+    Returns
+    -------
+    pl.DataFrame
+        The cleaned table, ready to be written to the curated database.
+    """
+    level_scale_df = read_data_from_sql(read_conn, "level_scale_anchors")
+    return clean_func(level_scale_df)
+
+
+# Curated table name -> transform, in load order
+TRANSFORMS = [
+    ("fact_abilities", transform_abilities),
+    ("fact_education_training_experience", transform_education_training_experience),
+    ("dim_job_zone_reference", transform_job_zone_reference),
+    ("dim_occupation_data", transform_occupation_data),
+    ("dim_occupation_level_metadata", transform_occupation_level_metadata),
+    ("fact_job_zones", transform_job_zones),
+    ("fact_knowledge", transform_knowledge),
+    ("fact_skills", transform_skills),
+    ("dim_level_scale_anchors", transform_level_scale_anchors)
+]
+
+
+# -----------------------------
+# Checkpoint Utilities
+# -----------------------------
+def raw_db_fingerprint(raw_db_name: str) -> list[int]:
+    """
+    Identifies the state of the raw database so a checkpoint taken against an
+    older raw load is not resumed.
+
+    Parameters
+    ----------
+    raw_db_name : str
+        Path to the raw SQLite database.
+
+    Returns
+    -------
+    list[int]
+        Modification time (ns) and size of the raw database file.
+    """
+    stat = os.stat(raw_db_name)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def load_checkpoint(checkpoint_path: Path, raw_db_name: str) -> list[str]:
+    """
+    Reads the tables already staged by a previous, interrupted run.
+
+    Parameters
+    ----------
+    checkpoint_path : Path
+        Path to the JSON checkpoint file.
+    raw_db_name : str
+        Path to the raw SQLite database the run reads from.
+
+    Returns
+    -------
+    list[str]
+        Completed curated table names; empty if there is nothing to resume.
+    """
+    if not checkpoint_path.exists():
+        return []
+
+    checkpoint = json.loads(checkpoint_path.read_text(encoding="utf-8"))
+    if checkpoint.get("raw_db") != raw_db_fingerprint(raw_db_name):
+        print("Raw database changed since last checkpoint; starting over")
+        return []
+    return checkpoint["completed"]
+
+
+def save_checkpoint(checkpoint_path: Path, raw_db_name: str, completed: list[str]) -> None:
+    """
+    Atomically records which curated tables have been staged.
+
+    Parameters
+    ----------
+    checkpoint_path : Path
+        Path to the JSON checkpoint file.
+    raw_db_name : str
+        Path to the raw SQLite database the run reads from.
+    completed : list[str]
+        Curated table names staged so far.
+    """
+    tmp_path = checkpoint_path.with_suffix(".tmp")
+    tmp_path.write_text(
+        json.dumps({"raw_db": raw_db_fingerprint(raw_db_name), "completed": completed}),
+        encoding="utf-8"
+    )
+    os.replace(tmp_path, checkpoint_path)
+
+
+# -----------------------------
+# Checkpointed Load
+# -----------------------------
+def run_transform_load(raw_db_name: str, curated_db_name: str) -> None:
+    """
+    Transforms every raw table and swaps the result in as the curated database.
+
+    Tables are staged into `<curated_db>.building` and recorded in
+    `<curated_db>.checkpoint.json` as they complete. Only after every table is
+    staged is the building file renamed over the curated database, so readers
+    never see a partly rebuilt warehouse. A failed run leaves both files
+    behind, and the next run skips the tables that were already staged.
+
+    Parameters
+    ----------
+    raw_db_name : str
+        Path to the raw SQLite database.
+    curated_db_name : str
+        Path to the curated SQLite database to replace.
+    """
+    build_path = Path(f"{curated_db_name}.building")
+    checkpoint_path = Path(f"{curated_db_name}.checkpoint.json")
+
+    build_path.parent.mkdir(parents=True, exist_ok=True)
+    completed = load_checkpoint(checkpoint_path, raw_db_name) if build_path.exists() else []
+    if not completed:
+        build_path.unlink(missing_ok=True)
+
+    read_conn = db_connection(raw_db_name)
+    engine = create_engine(f"sqlite:///{build_path}")
+    try:
+        for table_name, transform in TRANSFORMS:
+            if table_name in completed:
+                print(f"Skipping already staged table: {table_name}")
+                continue
+
+            write_data_to_sql(engine, transform(read_conn), table_name, raise_on_error=True)
+
+            completed.append(table_name)
+            save_checkpoint(checkpoint_path, raw_db_name, completed)
+            print(f"Staged table: {table_name}")
+    finally:
+        engine.dispose()
+        close_connection(read_conn)
+
+    os.replace(build_path, curated_db_name)
+    checkpoint_path.unlink()
+    print(f"Swapped in curated database: {curated_db_name}")
 
-# Level Scale Anchors
-level_scale_df = read_data_from_sql(read_conn, "level_scale_anchors")
-level_scale_df = clean_func(level_scale_df)
-write_data_to_sql(engine, level_scale_df, "dim_level_scale_anchors")
 
-# Close connection
-close_connection(read_conn)
\ No newline at end of file
+if __name__ == "__main__":
+    run_transform_load(raw_db, curated_db)